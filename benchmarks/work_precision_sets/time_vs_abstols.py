@@ -1,9 +1,15 @@
 import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+import argparse
 import itertools
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 
 
+RESULTS_DIR = "benchmarks/work_precision_sets/results"
+
 parameters = ["Marquis2019", "Ecker2015", "Ramadass2004", "Chen2020"]
 
 models = {"SPM": pybamm.lithium_ion.SPM(), "DFN": pybamm.lithium_ion.DFN()}
@@ -28,20 +34,57 @@ solvers = {
 }
 
 
-fig, axs = plt.subplots(len(solvers), len(models), figsize=(8, 10))
-
-for ax, i, j in zip(
-    axs.ravel(),
-    itertools.product(solvers.values(), models.values()),
-    itertools.product(solvers, models),
-):
-    for params in parameters:
-        time_points = []
-        solver = i[0]
-
-        model = i[1].new_copy()
-        c_rate = 1
-        tmax = 3500 / c_rate
+def discretised_model(model_name, params):
+    """Copy of a model discretised with the given parameter set"""
+    model = models[model_name].new_copy()
+    geometry = model.default_geometry
+
+    # load parameter values and process model and geometry
+    param = pybamm.ParameterValues(params)
+    param.process_model(model)
+    param.process_geometry(geometry)
+
+    # set mesh
+    var_pts = {
+        "x_n": 20,
+        "x_s": 20,
+        "x_p": 20,
+        "r_n": 30,
+        "r_p": 30,
+        "y": 10,
+        "z": 10,
+    }
+    mesh = pybamm.Mesh(geometry, model.default_submesh_types, var_pts)
+
+    # discretise model
+    disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+    disc.process_model(model)
+    return model
+
+
+def mean_solve_time(solver, model, t_eval, t_interp, runs=20):
+    """Mean solve time of a discretised model over a number of runs"""
+    times = np.empty(runs)
+    for k in range(runs):
+        solution = solver.solve(model, t_eval=t_eval, t_interp=t_interp)
+        times[k] = solution.solve_time.value
+    return times.mean()
+
+
+def solve_cell(model_name, params):
+    """
+    Mean solve times against abstols for each solver, for one model and parameter
+    set. The model is discretised once and each solver sets up its own copy.
+    """
+    discretised = discretised_model(model_name, params)
+    c_rate = 1
+    tmax = 3500 / c_rate
+    results = {}
+    for solver_name, solver in solvers.items():
+        # a solver can only be set up for one model, so each model copy gets its
+        # own solver
+        solver = solver.copy()
+        model = discretised.new_copy()
         if solver.supports_interp:
             t_eval = np.array([0, tmax])
             t_interp = None
@@ -49,61 +92,70 @@ for ax, i, j in zip(
             nb_points = 500
             t_eval = np.linspace(0, tmax, nb_points)
             t_interp = None
-        geometry = model.default_geometry
-
-        # load parameter values and process model and geometry
-        param = pybamm.ParameterValues(params)
-        param.process_model(model)
-        param.process_geometry(geometry)
-
-        # set mesh
-        var_pts = {
-            "x_n": 20,
-            "x_s": 20,
-            "x_p": 20,
-            "r_n": 30,
-            "r_p": 30,
-            "y": 10,
-            "z": 10,
-        }
-        mesh = pybamm.Mesh(geometry, model.default_submesh_types, var_pts)
-
-        # discretise model
-        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
-        disc.process_model(model)
 
+        # warm up once, the solver keeps its set-up across tolerances
+        solver.atol = abstols[0]
+        solver.solve(model, t_eval=t_eval, t_interp=t_interp)
+
+        time_points = []
         for tol in abstols:
             solver.atol = tol
-            solver.solve(model, t_eval=t_eval, t_interp=t_interp)
-            time = 0
-            runs = 20
-            for _ in range(0, runs):
-                solution = solver.solve(model, t_eval=t_eval, t_interp=t_interp)
-                time += solution.solve_time.value
-            time = time / runs
-
-            time_points.append(time)
-
-        ax.set_xscale("log")
-        ax.set_yscale("log")
-        ax.set_xlabel("abstols")
-        ax.set_ylabel("time(s)")
-        ax.set_title(f"{j[1]} with {j[0]}")
-        ax.plot(abstols, time_points)
-
-plt.tight_layout()
-plt.gca().legend(
-    parameters,
-    loc="lower right",
-)
-
-
-plt.savefig(f"benchmarks/benchmark_images/time_vs_abstols_{pybamm.__version__}.png")
-
-
-content = f"# PyBaMM {pybamm.__version__}\n## Solve Time vs Abstols\n<img src='./benchmark_images/time_vs_abstols_{pybamm.__version__}.png'>\n"
-
-with open("./benchmarks/release_work_precision_sets.md") as original:
-    data = original.read()
-with open("./benchmarks/release_work_precision_sets.md", "w") as modified:
-    modified.write(f"{content}\n{data}")
+            time_points.append(mean_solve_time(solver, model, t_eval, t_interp))
+        results[solver_name] = time_points
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of (model, parameter set) cells to solve at once. The results "
+            "are wall-clock solve times, and parallel solves compete for cores and "
+            "memory bandwidth, so keep the default of 1 for published timings."
+        ),
+    )
+    args = parser.parse_args()
+
+    # each (model, parameter set) cell is independent, so they can be solved in
+    # separate processes, with only the plotting done in this process
+    cells = list(itertools.product(models, parameters))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = dict(zip(cells, executor.map(solve_cell, *zip(*cells))))
+
+    # the raw timings are kept out of the repository (see .gitignore)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(
+        os.path.join(RESULTS_DIR, f"time_vs_abstols_{pybamm.__version__}.pkl"), "wb"
+    ) as f:
+        pickle.dump(results, f)
+
+    fig, axs = plt.subplots(len(solvers), len(models), figsize=(8, 10))
+
+    for si, solver_name in enumerate(solvers):
+        for mi, model_name in enumerate(models):
+            ax = axs[si, mi]
+            for params in parameters:
+                ax.set_xscale("log")
+                ax.set_yscale("log")
+                ax.set_xlabel("abstols")
+                ax.set_ylabel("time(s)")
+                ax.set_title(f"{model_name} with {solver_name}")
+                ax.plot(abstols, results[model_name, params][solver_name])
+
+    plt.tight_layout()
+    plt.gca().legend(
+        parameters,
+        loc="lower right",
+    )
+
+    plt.savefig(f"benchmarks/benchmark_images/time_vs_abstols_{pybamm.__version__}.png")
+
+    content = f"# PyBaMM {pybamm.__version__}\n## Solve Time vs Abstols\n<img src='./benchmark_images/time_vs_abstols_{pybamm.__version__}.png'>\n"
+
+    with open("./benchmarks/release_work_precision_sets.md") as original:
+        data = original.read()
+    with open("./benchmarks/release_work_precision_sets.md", "w") as modified:
+        modified.write(f"{content}\n{data}")
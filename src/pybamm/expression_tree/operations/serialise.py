@@ -5,7 +5,23 @@ from datetime import datetime
 import json
 import importlib
 import numpy as np
+import os
 import re
+import types
+
+_QUALIFIED_NAME_CACHE: dict[type, str] = {}
+_CLASS_CACHE: dict[str, type] = {}
+
+# kinds of encoded node, found once per node when reconstructing expression trees
+_SYMBOL, _EXPLICIT_TIME_INTEGRAL, _EVENT, _LEAF = range(4)
+
+
+def _qualified_name(cls: type) -> str:
+    """Returns the full import path of a class, caching the result per class"""
+    name = _QUALIFIED_NAME_CACHE.get(cls)
+    if name is None:
+        name = _QUALIFIED_NAME_CACHE[cls] = f"{cls.__module__}.{cls.__qualname__}"
+    return name
 
 
 class Serialise:
@@ -21,33 +37,63 @@ class Serialise:
         """Converts PyBaMM symbols into a JSON-serialisable format"""
 
         def default(self, node: dict):
-            node_dict = {"py/object": str(type(node))[8:-2], "py/id": id(node)}
-            if isinstance(node, pybamm.Symbol):
-                node_dict.update(node.to_json())  # this doesn't include children
-                node_dict["children"] = []
-                for c in node.children:
-                    node_dict["children"].append(self.default(c))
-
-                if hasattr(node, "initial_condition"):  # for ExplicitTimeIntegral
-                    node_dict["initial_condition"] = self.default(
-                        node.initial_condition
-                    )
-
-                return node_dict
-
-            if isinstance(node, pybamm.Event):
-                node_dict.update(node.to_json())
-                node_dict["expression"] = self.default(node._expression)
-                return node_dict
+            if isinstance(node, (pybamm.Symbol, pybamm.Event)):
+                return self._encode_tree(node)
 
+            node_dict = {"py/object": _qualified_name(type(node)), "py/id": id(node)}
             node_dict["json"] = json.JSONEncoder.default(self, node)  # pragma: no cover
             return node_dict  # pragma: no cover
 
+        def _encode_tree(self, root: pybamm.Symbol | pybamm.Event):
+            """
+            Encodes an expression tree (or event) using an explicit post-order
+            traversal, so that encoding deep trees does not hit the recursion limit.
+            Each node is encoded once its children have been, with the encoded
+            children looked up by id.
+
+            Note that the nested dictionary this returns is still written by
+            json.dumps and read by json.load, which both recurse once per level, so
+            saving and loading a model remain limited by the recursion limit.
+            """
+            encoded = {}
+            stack = [(root, False)]
+            while stack:
+                node, children_encoded = stack.pop()
+                if id(node) in encoded:
+                    continue
+
+                if not children_encoded:
+                    stack.append((node, True))
+                    if isinstance(node, pybamm.Symbol):
+                        stack.extend((c, False) for c in node.children)
+                        if isinstance(node, pybamm.ExplicitTimeIntegral):
+                            stack.append((node.initial_condition, False))
+                    else:
+                        stack.append((node._expression, False))
+                    continue
+
+                node_dict = {
+                    "py/object": _qualified_name(type(node)),
+                    "py/id": id(node),
+                }
+                node_dict.update(node.to_json())  # this doesn't include children
+                if isinstance(node, pybamm.Symbol):
+                    node_dict["children"] = [encoded[id(c)] for c in node.children]
+                    if isinstance(node, pybamm.ExplicitTimeIntegral):
+                        node_dict["initial_condition"] = encoded[
+                            id(node.initial_condition)
+                        ]
+                else:
+                    node_dict["expression"] = encoded[id(node._expression)]
+                encoded[id(node)] = node_dict
+
+            return encoded[id(root)]
+
     class _MeshEncoder(json.JSONEncoder):
         """Converts PyBaMM meshes into a JSON-serialisable format"""
 
         def default(self, node: pybamm.Mesh):
-            node_dict = {"py/object": str(type(node))[8:-2], "py/id": id(node)}
+            node_dict = {"py/object": _qualified_name(type(node)), "py/id": id(node)}
             if isinstance(node, pybamm.Mesh):
                 node_dict.update(node.to_json())
 
@@ -67,16 +113,6 @@ class Serialise:
             node_dict["json"] = json.JSONEncoder.default(self, node)  # pragma: no cover
             return node_dict  # pragma: no cover
 
-    class _Empty:
-        """A dummy class to aid deserialisation"""
-
-        pass
-
-    class _EmptyDict(dict):
-        """A dummy dictionary class to aid deserialisation"""
-
-        pass
-
     def save_model(
         self,
         model: pybamm.BaseModel,
@@ -108,40 +144,61 @@ class Serialise:
                 "PyBaMM can only serialise a discretised, ready-to-solve model."
             )
 
-        model_json = {
-            "py/object": str(type(model))[8:-2],
-            "py/id": id(model),
-            "pybamm_version": pybamm.__version__,
-            "name": model.name,
-            "options": model.options,
-            "bounds": [bound.tolist() for bound in model.bounds],  # type: ignore[attr-defined]
-            "concatenated_rhs": self._SymbolEncoder().default(model._concatenated_rhs),
-            "concatenated_algebraic": self._SymbolEncoder().default(
-                model._concatenated_algebraic
-            ),
-            "concatenated_initial_conditions": self._SymbolEncoder().default(
-                model._concatenated_initial_conditions
-            ),
-            "events": [self._SymbolEncoder().default(event) for event in model.events],
-            "mass_matrix": self._SymbolEncoder().default(model.mass_matrix),
-            "mass_matrix_inv": self._SymbolEncoder().default(model.mass_matrix_inv),
-        }
-
-        if mesh:
-            model_json["mesh"] = self._MeshEncoder().default(mesh)
-
-        if variables:
-            if model._geometry:
-                model_json["geometry"] = self._deconstruct_pybamm_dicts(model._geometry)
-            model_json["variables"] = {
-                k: self._SymbolEncoder().default(v) for k, v in dict(variables).items()
-            }
+        symbol_encoder = self._SymbolEncoder()
+
+        def model_json_items():
+            # Fields are encoded as they are written out, so that only one encoded
+            # expression tree is held in memory at a time
+            yield "py/object", _qualified_name(type(model))
+            yield "py/id", id(model)
+            yield "pybamm_version", pybamm.__version__
+            yield "name", model.name
+            yield "options", model.options
+            yield "bounds", [bound.tolist() for bound in model.bounds]  # type: ignore[attr-defined]
+            yield "concatenated_rhs", symbol_encoder.default(model._concatenated_rhs)
+            yield (
+                "concatenated_algebraic",
+                symbol_encoder.default(model._concatenated_algebraic),
+            )
+            yield (
+                "concatenated_initial_conditions",
+                symbol_encoder.default(model._concatenated_initial_conditions),
+            )
+            yield "events", [symbol_encoder.default(event) for event in model.events]
+            # mass matrices are None when there are no equations of that type
+            for name in ["mass_matrix", "mass_matrix_inv"]:
+                matrix = getattr(model, name)
+                yield name, None if matrix is None else symbol_encoder.default(matrix)
+
+            if mesh:
+                yield "mesh", self._MeshEncoder().default(mesh)
+
+            if variables:
+                if model._geometry:
+                    yield "geometry", self._deconstruct_pybamm_dicts(model._geometry)
+                yield (
+                    "variables",
+                    (
+                        (k, symbol_encoder.default(v))
+                        for k, v in dict(variables).items()
+                    ),
+                )
 
         if filename is None:
             filename = model.name + "_" + datetime.now().strftime("%Y_%m_%d-%p%I_%M")
 
-        with open(filename + ".json", "w") as f:
-            json.dump(model_json, f)
+        # the model is encoded while it is written, so write to a temporary file and
+        # only replace the target once the whole model has been written
+        path = filename + ".json"
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                self._write_json_object(f, model_json_items())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
     def load_model(
         self, filename: str, battery_model: pybamm.BaseModel | None = None
@@ -181,7 +238,8 @@ class Serialise:
         recon_model_dict = {
             "name": model_data["name"],
             "options": self._convert_options(model_data["options"]),
-            "bounds": tuple(np.array(bound) for bound in model_data["bounds"]),
+            # convert both bounds in one call, with the dtype given up front
+            "bounds": tuple(np.array(model_data["bounds"], dtype=float)),
             "concatenated_rhs": self._reconstruct_expression_tree(
                 model_data["concatenated_rhs"]
             ),
@@ -195,12 +253,15 @@ class Serialise:
                 self._reconstruct_expression_tree(event)
                 for event in model_data["events"]
             ],
-            "mass_matrix": self._reconstruct_expression_tree(model_data["mass_matrix"]),
-            "mass_matrix_inv": self._reconstruct_expression_tree(
-                model_data["mass_matrix_inv"]
-            ),
         }
 
+        for name in ["mass_matrix", "mass_matrix_inv"]:
+            recon_model_dict[name] = (
+                None
+                if model_data[name] is None
+                else self._reconstruct_expression_tree(model_data[name])
+            )
+
         recon_model_dict["geometry"] = (
             self._reconstruct_pybamm_dict(model_data["geometry"])
             if "geometry" in model_data.keys()
@@ -239,23 +300,35 @@ class Serialise:
 
     def _get_pybamm_class(self, snippet: dict):
         """Find a pybamm class to initialise from object path"""
-        parts = snippet["py/object"].split(".")
-        module = importlib.import_module(".".join(parts[:-1]))
+        object_path = snippet["py/object"]
+        class_ = _CLASS_CACHE.get(object_path)
+        if class_ is None:
+            parts = object_path.split(".")
+            module = importlib.import_module(".".join(parts[:-1]))
 
-        class_ = getattr(module, parts[-1])
+            class_ = _CLASS_CACHE[object_path] = getattr(module, parts[-1])
 
-        try:
-            empty_class = self._Empty()
-            empty_class.__class__ = class_
+        # an uninitialised instance gives access to the deserialisation methods
+        return class_.__new__(class_)
 
-            return empty_class
-
-        except TypeError:
-            # Mesh objects have a different layouts
-            empty_dict_class = self._EmptyDict()
-            empty_dict_class.__class__ = class_
+    def _write_json_object(self, f, items):
+        """
+        Writes (key, value) pairs to a file as a JSON object, one pair at a time.
+        Values which are generators of pairs are written as nested objects.
 
-            return empty_dict_class
+        Each value is encoded with json.dumps, which uses the C encoder, unlike
+        json.dump which streams through the pure-Python encoder.
+        """
+        f.write("{")
+        for i, (key, value) in enumerate(items):
+            if i > 0:
+                f.write(", ")
+            f.write(json.dumps(key) + ": ")
+            if isinstance(value, types.GeneratorType):
+                self._write_json_object(f, value)
+            else:
+                f.write(json.dumps(value))
+        f.write("}")
 
     def _deconstruct_pybamm_dicts(self, dct: dict):
         """
@@ -281,12 +354,14 @@ class Serialise:
         Dictionaries which don't contain pybamm symbols are returned unchanged.
         """
 
+        symbol_encoder = self._SymbolEncoder()
+
         def nested_convert(obj):
             if isinstance(obj, dict):
                 new_dict = {}
                 for k, v in obj.items():
                     if isinstance(k, pybamm.Symbol):
-                        new_k = self._SymbolEncoder().default(k)
+                        new_k = symbol_encoder.default(k)
                         new_dict["symbol_" + new_k["name"]] = new_k
                         k = new_k["name"]
                     new_dict[k] = nested_convert(v)
@@ -311,24 +386,55 @@ class Serialise:
 
         Conducts post-order tree traversal to turn each tree node into a
         `pybamm.Symbol` class, starting from leaf nodes without children and
-        working upwards.
+        working upwards. The traversal uses an explicit stack rather than
+        recursion, so deep trees do not hit the recursion limit.
 
         Parameters
         ----------
         node: dict
             A node in an expression tree.
         """
-        if "children" in node:
-            for i, c in enumerate(node["children"]):
-                child_obj = self._reconstruct_expression_tree(c)
-                node["children"][i] = child_obj
-        elif "expression" in node:
-            expression_obj = self._reconstruct_expression_tree(node["expression"])
-            node["expression"] = expression_obj
-
-        obj = self._reconstruct_symbol(node)
-
-        return obj
+        reconstructed = {}
+        # nodes are first pushed without a kind, and pushed again with their kind
+        # once it has been looked up and their sub-trees queued
+        stack = [(node, None)]
+        while stack:
+            current, kind = stack.pop()
+            if id(current) in reconstructed:
+                continue
+
+            if kind is None:
+                if "children" in current:
+                    sub_nodes = current["children"]
+                    if "initial_condition" in current:
+                        kind = _EXPLICIT_TIME_INTEGRAL
+                        sub_nodes = [*sub_nodes, current["initial_condition"]]
+                    else:
+                        kind = _SYMBOL
+                elif "expression" in current:
+                    kind = _EVENT
+                    sub_nodes = [current["expression"]]
+                else:
+                    kind = _LEAF
+                    sub_nodes = []
+                stack.append((current, kind))
+                stack.extend((n, None) for n in sub_nodes)
+                continue
+
+            if kind == _SYMBOL or kind == _EXPLICIT_TIME_INTEGRAL:
+                current["children"] = [
+                    reconstructed[id(c)] for c in current["children"]
+                ]
+                if kind == _EXPLICIT_TIME_INTEGRAL:
+                    current["initial_condition"] = reconstructed[
+                        id(current["initial_condition"])
+                    ]
+            elif kind == _EVENT:
+                current["expression"] = reconstructed[id(current["expression"])]
+
+            reconstructed[id(current)] = self._reconstruct_symbol(current)
+
+        return reconstructed[id(node)]
 
     def _reconstruct_mesh(self, node: dict):
         """Reconstructs a Mesh object"""
@@ -4,6 +4,7 @@
 
 import json
 import os
+import sys
 import pytest
 from datetime import datetime
 import numpy as np
@@ -252,6 +253,32 @@ class TestSerialise:
         event_ser_json = Serialise._SymbolEncoder().default(event)
         assert event_ser_json == event_json
 
+    def test_symbol_encoder_deep_tree(self):
+        """test symbol encoder on a deep tree with a repeated child"""
+        a = pybamm.Scalar(1)
+        expr = a
+        # deeper than the recursion limit, so a recursive encoder would fail
+        depth = sys.getrecursionlimit()
+        # debug mode checks the shape of the whole tree, recursively, every time a
+        # node is added
+        debug_mode = pybamm.settings.debug_mode
+        pybamm.settings.debug_mode = False
+        try:
+            for i in range(depth):
+                expr = pybamm.Multiplication(pybamm.Addition(expr, pybamm.Scalar(i)), a)
+        finally:
+            pybamm.settings.debug_mode = debug_mode
+
+        node = Serialise._SymbolEncoder().default(expr)
+
+        for i in reversed(range(depth)):
+            assert node["name"] == "*"
+            assert node["children"][1]["value"] == 1.0
+            addition = node["children"][0]
+            assert addition["children"][1]["value"] == i
+            node = addition["children"][0]
+        assert node["value"] == 1.0
+
     # test the mesh encoder
     def test_mesh_encoder(self, mocker):
         mesh, mesh_json = mesh_var_dict(mocker)
@@ -261,6 +288,26 @@ class TestSerialise:
 
         assert mesh_ser_json == mesh_json
 
+    def test_write_json_object(self, tmp_path):
+        items = [
+            ("a", 1),
+            ("b", [1.0, float("inf")]),
+            ("c", ((k, {"value": v}) for k, v in [("x", 2), ("y", 3)])),
+            ("d", {"e": None}),
+        ]
+        filename = tmp_path / "test.json"
+
+        with open(filename, "w") as f:
+            Serialise()._write_json_object(f, iter(items))
+
+        with open(filename) as f:
+            assert json.load(f) == {
+                "a": 1,
+                "b": [1.0, float("inf")],
+                "c": {"x": {"value": 2}, "y": {"value": 3}},
+                "d": {"e": None},
+            }
+
     def test_deconstruct_pybamm_dicts(self, mocker):
         """tests serialisation of dictionaries with pybamm classes as keys"""
 
@@ -396,6 +443,15 @@ class TestSerialise:
 
         assert new_equation == equation
 
+    def test_reconstruct_expression_tree_explicit_time_integral(self):
+        expr = pybamm.ExplicitTimeIntegral(pybamm.Scalar(5), pybamm.Scalar(1))
+        expr_json = Serialise._SymbolEncoder().default(expr)
+
+        new_expr = Serialise()._reconstruct_expression_tree(expr_json)
+
+        assert new_expr == expr
+        assert new_expr.initial_condition == expr.initial_condition
+
     def test_reconstruct_mesh(self, mocker):
         mesh, mesh_dict = mesh_var_dict(mocker)
 
@@ -493,6 +549,9 @@ class TestSerialise:
 
         # default load
         new_model = Serialise().load_model("test_model.json")
+        for bound, new_bound in zip(model.bounds, new_model.bounds):
+            np.testing.assert_array_equal(bound, new_bound)
+            assert new_bound.dtype == np.float64
 
         # check new model solves
         new_solver = new_model.default_solver
@@ -527,6 +586,48 @@ class TestSerialise:
         newest_solver = newest_model.default_solver
         newest_solver.solve(newest_model, [0, 3600])
 
+    def test_save_load_algebraic_model(self, tmp_path):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.algebraic = {var: var - 1}
+        model.initial_conditions = {var: 0}
+        pybamm.Discretisation().process_model(model)
+        assert model.mass_matrix_inv is None
+
+        filename = str(tmp_path / "test_algebraic_model")
+        Serialise().save_model(model, filename=filename)
+        new_model = Serialise().load_model(
+            filename + ".json", battery_model=pybamm.BaseModel()
+        )
+
+        assert new_model.mass_matrix_inv is None
+        solution = pybamm.AlgebraicSolver().solve(new_model, [0])
+        np.testing.assert_allclose(solution.y, 1)
+
+    def test_save_model_failure_leaves_file(self, tmp_path):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -var}
+        model.initial_conditions = {var: 1}
+        pybamm.Discretisation().process_model(model)
+        # broadcasts can't be serialised, so saving fails part way through
+        variables = {"bad": pybamm.PrimaryBroadcast(var, "negative electrode")}
+
+        filename = str(tmp_path / "test_model")
+        with pytest.raises(NotImplementedError):
+            Serialise().save_model(model, variables=variables, filename=filename)
+        assert os.listdir(tmp_path) == []
+
+        # an existing file is not overwritten
+        Serialise().save_model(model, filename=filename)
+        with open(filename + ".json") as f:
+            saved = f.read()
+        with pytest.raises(NotImplementedError):
+            Serialise().save_model(model, variables=variables, filename=filename)
+        with open(filename + ".json") as f:
+            assert f.read() == saved
+        assert os.listdir(tmp_path) == ["test_model.json"]
+
     def test_save_experiment_model_error(self):
         model = pybamm.lithium_ion.SPM()
         experiment = pybamm.Experiment(["Discharge at 1C for 1 hour"])
@@ -8,46 +8,91 @@ from tests import get_mesh_for_testing, get_discretisation_for_testing
 import warnings
 
 
-class TestScipySolver:
-    def test_model_solver_python_and_jax(self):
-        if pybamm.has_jax():
-            formats = ["python", "jax"]
-        else:
-            formats = ["python"]
+def _read_only_linspace(stop, num):
+    t_eval = np.linspace(0, stop, num)
+    t_eval.setflags(write=False)
+    return t_eval
+
+
+# time points shared between tests, read-only so that no solver can change them
+_T_EVAL_1_50 = _read_only_linspace(1, 50)
+_T_EVAL_1_80 = _read_only_linspace(1, 80)
+_T_EVAL_1_100 = _read_only_linspace(1, 100)
+_T_EVAL_3_100 = _read_only_linspace(3, 100)
+_T_EVAL_5_100 = _read_only_linspace(5, 100)
+_T_EVAL_10_100 = _read_only_linspace(10, 100)
+
+
+def assert_all_sensitivities(sensitivities, names):
+    """
+    Check that the columns of sensitivities["all"] are the sensitivities with
+    respect to each of names, in order
+    """
+    all_sensitivities = sensitivities["all"]
+    start = 0
+    for name in names:
+        end = start + sensitivities[name].shape[1]
+        np.testing.assert_allclose(all_sensitivities[:, start:end], sensitivities[name])
+        start = end
+    assert all_sensitivities.shape[1] == end
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    return get_mesh_for_testing()
+
+
+@pytest.fixture
+def disc(mesh):
+    # process_model changes the discretisation, so each test gets a fresh one
+    # built on the shared mesh
+    return pybamm.Discretisation(mesh, {"macroscale": pybamm.FiniteVolume()})
+
+
+# the jax format is only tested when jax is installed
+python_and_jax_formats = pytest.mark.parametrize(
+    "convert_to_format",
+    [
+        "python",
+        pytest.param(
+            "jax",
+            marks=pytest.mark.skipif(
+                not pybamm.has_jax(), reason="jax or jaxlib is not installed"
+            ),
+        ),
+    ],
+)
 
-        for convert_to_format in formats:
-            # Create model
-            model = pybamm.BaseModel()
-            model.convert_to_format = convert_to_format
-            domain = ["negative electrode", "separator", "positive electrode"]
-            var = pybamm.Variable("var", domain=domain)
-            model.rhs = {var: 0.1 * var}
-            model.initial_conditions = {var: 1}
-            # No need to set parameters;
-            # can use base discretisation (no spatial operators)
 
-            # create discretisation
-            mesh = get_mesh_for_testing()
-            spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-            disc = pybamm.Discretisation(mesh, spatial_methods)
-            disc.process_model(model)
-            # Solve
-            # Make sure that passing in extra options works
-            solver = pybamm.ScipySolver(
-                rtol=1e-8, atol=1e-8, method="RK45", extra_options={"first_step": 1e-4}
-            )
-            t_eval = np.linspace(0, 1, 80)
-            solution = solver.solve(model, t_eval)
-            np.testing.assert_array_equal(solution.t, t_eval)
-            np.testing.assert_allclose(solution.y[0], np.exp(0.1 * solution.t))
+class TestScipySolver:
+    @python_and_jax_formats
+    def test_model_solver_python_and_jax(self, convert_to_format, disc):
+        # No need to set parameters;
+        # can use base discretisation (no spatial operators)
+        domain = ["negative electrode", "separator", "positive electrode"]
+        t_eval = _T_EVAL_1_80
+
+        # Create model
+        model = pybamm.BaseModel()
+        model.convert_to_format = convert_to_format
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: 0.1 * var}
+        model.initial_conditions = {var: 1}
+        disc.process_model(model)
+        # Solve
+        # Make sure that passing in extra options works
+        solver = pybamm.ScipySolver(
+            rtol=1e-8, atol=1e-8, method="RK45", extra_options={"first_step": 1e-4}
+        )
+        solution = solver.solve(model, t_eval)
+        np.testing.assert_array_equal(solution.t, t_eval)
+        np.testing.assert_allclose(solution.y[0], np.exp(0.1 * solution.t))
 
-            # Test time
-            assert solution.total_time == solution.solve_time + solution.set_up_time
-            assert solution.termination == "final time"
+        # Test time
+        assert solution.total_time == solution.solve_time + solution.set_up_time
+        assert solution.termination == "final time"
 
     def test_model_solver_failure(self):
-        # Turn off warnings to ignore sqrt error
-        warnings.simplefilter("ignore")
         model = pybamm.BaseModel()
         model.convert_to_format = "python"
         var = pybamm.Variable("var")
@@ -59,16 +104,16 @@ class TestScipySolver:
         disc = pybamm.Discretisation()
         disc.process_model(model)
 
-        t_eval = np.linspace(0, 3, 100)
+        t_eval = _T_EVAL_3_100
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
         # Expect solver to fail when y goes negative
-        with pytest.raises(pybamm.SolverError):
-            solver.solve(model, t_eval)
-
-        # Turn warnings back on
-        warnings.simplefilter("default")
+        # Turn off warnings to ignore sqrt error
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            with pytest.raises(pybamm.SolverError):
+                solver.solve(model, t_eval)
 
-    def test_model_solver_with_event_python(self):
+    def test_model_solver_with_event_python(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "python"
@@ -84,14 +129,10 @@ class TestScipySolver:
         ]
         # No need to set parameters; can use base discretisation (no spatial operators)
 
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
         # Solve
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-        t_eval = np.linspace(0, 10, 100)
+        t_eval = _T_EVAL_10_100
         solution = solver.solve(model, t_eval)
         assert len(solution.t) < len(t_eval)
         np.testing.assert_array_equal(solution.t[:-1], t_eval[: len(solution.t) - 1])
@@ -102,57 +143,53 @@ class TestScipySolver:
         # Test event in solution variables_and_events
         np.testing.assert_array_almost_equal(solution["Event: var=0.5"].data[-1], 0)
 
-    def test_model_solver_ode_with_jacobian_python(self):
+    @python_and_jax_formats
+    def test_model_solver_ode_with_jacobian(self, convert_to_format, mesh, disc):
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        submesh = mesh[("negative electrode", "separator", "positive electrode")]
+        N = submesh.npts
+
+        # construct Jacobian in order of model.rhs (var1, var2): only the
+        # d(var1)/d(var1) and d(var2)/d(var1) blocks are non-zero
+        J = np.zeros((2 * N, 2 * N))
+        np.fill_diagonal(J[:N, :N], 1.0)
+        np.fill_diagonal(J[N:, :N], -1.0)
+
         # Create model
         model = pybamm.BaseModel()
-        model.convert_to_format = "python"
-        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        model.convert_to_format = convert_to_format
         var1 = pybamm.Variable("var1", domain=whole_cell)
         var2 = pybamm.Variable("var2", domain=whole_cell)
         model.rhs = {var1: var1, var2: 1 - var1}
         model.initial_conditions = {var1: 1.0, var2: -1.0}
-        model.variables = {"var1": var1, "var2": var2}
 
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
 
-        # Add user-supplied Jacobian to model
-        submesh = mesh[("negative electrode", "separator", "positive electrode")]
-        N = submesh.npts
-
-        # construct Jacobian in order of model.rhs
-        J = []
-        for var in model.rhs.keys():
-            if var == var1:
-                J.append([np.eye(N), np.zeros((N, N))])
-            else:
-                J.append([-1.0 * np.eye(N), np.zeros((N, N))])
-
-        J = np.block(J)
-
-        def jacobian(t, y):
-            return J
-
         # Solve
         solver = pybamm.ScipySolver(rtol=1e-9, atol=1e-9)
-        t_eval = np.linspace(0, 1, 100)
+        t_eval = _T_EVAL_1_100
         solution = solver.solve(model, t_eval)
         np.testing.assert_array_equal(solution.t, t_eval)
 
+        # The solver's Jacobian (from jax.jacfwd in the jax format) matches
+        # the one constructed by hand
+        jac = model.jac_rhs_eval(0, model.y0.flatten(), {})
+        if hasattr(jac, "toarray"):
+            jac = jac.toarray()
+        np.testing.assert_array_equal(jac, J)
+
+        # var1 and var2 are stacked in the state vector in order of model.rhs
         T, Y = solution.t, solution.y
         np.testing.assert_array_almost_equal(
-            model.variables["var1"].evaluate(T, Y),
+            Y[:N],
             np.ones((N, T.size)) * np.exp(T[np.newaxis, :]),
         )
         np.testing.assert_array_almost_equal(
-            model.variables["var2"].evaluate(T, Y),
+            Y[N:],
             np.ones((N, T.size)) * (T[np.newaxis, :] - np.exp(T[np.newaxis, :])),
         )
 
-    def test_model_step_python(self):
+    def test_model_step_python(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "python"
@@ -161,10 +198,6 @@ class TestScipySolver:
         model.rhs = {var: 0.1 * var}
         model.initial_conditions = {var: 1}
 
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
 
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
@@ -222,7 +255,7 @@ class TestScipySolver:
         with pytest.raises(RuntimeError, match="already been initialised"):
             solver.step(step_sol1, model2, dt)
 
-    def test_model_solver_with_inputs(self):
+    def test_model_solver_with_inputs(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "python"
@@ -233,20 +266,16 @@ class TestScipySolver:
         # No need to set parameters; can use base discretisation (no spatial
         # operators)
         model.events = [pybamm.Event("var=0.5", pybamm.min(var - 0.5))]
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
         # Solve
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-        t_eval = np.linspace(0, 10, 100)
+        t_eval = _T_EVAL_10_100
         solution = solver.solve(model, t_eval, inputs={"rate": 0.1})
         assert len(solution.t) < len(t_eval)
         np.testing.assert_array_equal(solution.t[:-1], t_eval[: len(solution.t) - 1])
         np.testing.assert_allclose(solution.y[0], np.exp(-0.1 * solution.t))
 
-    def test_model_solver_multiple_inputs_happy_path(self, subtests):
+    def test_model_solver_multiple_inputs_happy_path(self, disc, subtests):
         for convert_to_format in ["python", "casadi"]:
             # Create model
             model = pybamm.BaseModel()
@@ -255,14 +284,10 @@ class TestScipySolver:
             var = pybamm.Variable("var", domain=domain)
             model.rhs = {var: -pybamm.InputParameter("rate") * var}
             model.initial_conditions = {var: 1}
-            # create discretisation
-            mesh = get_mesh_for_testing()
-            spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-            disc = pybamm.Discretisation(mesh, spatial_methods)
             disc.process_model(model)
 
             solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-            t_eval = np.linspace(0, 10, 100)
+            t_eval = _T_EVAL_10_100
             ninputs = 8
             inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
 
@@ -275,7 +300,7 @@ class TestScipySolver:
                         solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
                     )
 
-    def test_model_solver_multiple_inputs_discontinuity_error(self):
+    def test_model_solver_multiple_inputs_discontinuity_error(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "casadi"
@@ -283,14 +308,10 @@ class TestScipySolver:
         var = pybamm.Variable("var", domain=domain)
         model.rhs = {var: -pybamm.InputParameter("rate") * var}
         model.initial_conditions = {var: 1}
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
 
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-        t_eval = np.linspace(0, 10, 100)
+        t_eval = _T_EVAL_10_100
         ninputs = 8
         inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
 
@@ -308,7 +329,7 @@ class TestScipySolver:
         ):
             solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
 
-    def test_model_solver_multiple_inputs_initial_conditions_error(self):
+    def test_model_solver_multiple_inputs_initial_conditions_error(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "casadi"
@@ -316,14 +337,10 @@ class TestScipySolver:
         var = pybamm.Variable("var", domain=domain)
         model.rhs = {var: -pybamm.InputParameter("rate") * var}
         model.initial_conditions = {var: 2 * pybamm.InputParameter("rate")}
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
 
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-        t_eval = np.linspace(0, 10, 100)
+        t_eval = _T_EVAL_10_100
         ninputs = 8
         inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
 
@@ -334,62 +351,56 @@ class TestScipySolver:
         ):
             solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
 
-    def test_model_solver_multiple_inputs_jax_format(self, subtests):
-        if pybamm.has_jax():
-            # Create model
-            model = pybamm.BaseModel()
-            model.convert_to_format = "jax"
-            domain = ["negative electrode", "separator", "positive electrode"]
-            var = pybamm.Variable("var", domain=domain)
-            model.rhs = {var: -pybamm.InputParameter("rate") * var}
-            model.initial_conditions = {var: 1}
-            # create discretisation
-            mesh = get_mesh_for_testing()
-            spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-            disc = pybamm.Discretisation(mesh, spatial_methods)
-            disc.process_model(model)
+    @pytest.mark.skipif(not pybamm.has_jax(), reason="jax or jaxlib is not installed")
+    def test_model_solver_multiple_inputs_jax_format(self, disc, subtests):
+        # Create model
+        model = pybamm.BaseModel()
+        model.convert_to_format = "jax"
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        disc.process_model(model)
 
-            solver = pybamm.JaxSolver(rtol=1e-8, atol=1e-8, method="RK45")
-            t_eval = np.linspace(0, 10, 100)
-            ninputs = 8
-            inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
+        solver = pybamm.JaxSolver(rtol=1e-8, atol=1e-8, method="RK45")
+        t_eval = _T_EVAL_10_100
+        ninputs = 8
+        inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
 
-            solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
-            for i in range(ninputs):
-                with subtests.test(i=i):
-                    solution = solutions[i]
-                    np.testing.assert_array_equal(solution.t, t_eval)
-                    np.testing.assert_allclose(
-                        solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
-                    )
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        for i in range(ninputs):
+            with subtests.test(i=i):
+                solution = solutions[i]
+                np.testing.assert_array_equal(solution.t, t_eval)
+                np.testing.assert_allclose(
+                    solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
+                )
 
-    def test_model_solver_with_event_with_casadi(self):
+    def test_model_solver_with_event_with_casadi(self, disc):
         # Create model
         model = pybamm.BaseModel()
+        model.convert_to_format = "casadi"
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        # needs to work with multiple events (to avoid bug where only last event is
+        # used)
+        model.events = [
+            pybamm.Event("var=0.5", pybamm.min(var - 0.5)),
+            pybamm.Event("var=-0.5", pybamm.min(var + 0.5)),
+        ]
+        # No need to set parameters; can use base discretisation (no spatial
+        # operators)
+
+        # use_jacobian is only read when the solver sets up the model, so the
+        # model is discretised once and reused
+        model_disc = disc.process_model(model, inplace=False)
+        t_eval = _T_EVAL_10_100
         for use_jacobian in [True, False]:
-            model.use_jacobian = use_jacobian
-            model.convert_to_format = "casadi"
-            domain = ["negative electrode", "separator", "positive electrode"]
-            var = pybamm.Variable("var", domain=domain)
-            model.rhs = {var: -0.1 * var}
-            model.initial_conditions = {var: 1}
-            # needs to work with multiple events (to avoid bug where only last event is
-            # used)
-            model.events = [
-                pybamm.Event("var=0.5", pybamm.min(var - 0.5)),
-                pybamm.Event("var=-0.5", pybamm.min(var + 0.5)),
-            ]
-            # No need to set parameters; can use base discretisation (no spatial
-            # operators)
-
-            # create discretisation
-            mesh = get_mesh_for_testing()
-            spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-            disc = pybamm.Discretisation(mesh, spatial_methods)
-            model_disc = disc.process_model(model, inplace=False)
+            model_disc.use_jacobian = use_jacobian
             # Solve
             solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-            t_eval = np.linspace(0, 10, 100)
             solution = solver.solve(model_disc, t_eval)
             assert len(solution.t) < len(t_eval)
             np.testing.assert_array_equal(
@@ -397,7 +408,7 @@ class TestScipySolver:
             )
             np.testing.assert_allclose(solution.y[0], np.exp(-0.1 * solution.t))
 
-    def test_model_solver_with_inputs_with_casadi(self):
+    def test_model_solver_with_inputs_with_casadi(self, disc):
         # Create model
         model = pybamm.BaseModel()
         model.convert_to_format = "casadi"
@@ -409,39 +420,34 @@ class TestScipySolver:
         # No need to set parameters; can use base discretisation (no spatial
         # operators)
 
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
         # Solve
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
-        t_eval = np.linspace(0, 10, 100)
+        t_eval = _T_EVAL_10_100
         solution = solver.solve(model, t_eval, inputs={"rate": 0.1})
         assert len(solution.t) < len(t_eval)
         np.testing.assert_array_equal(solution.t[:-1], t_eval[: len(solution.t) - 1])
         np.testing.assert_allclose(solution.y[0], np.exp(-0.1 * solution.t))
 
-    def test_model_solver_inputs_in_initial_conditions(self):
+    def test_model_solver_inputs_in_initial_conditions(self, subtests):
         # Create model
         model = pybamm.BaseModel()
         var1 = pybamm.Variable("var1")
         model.rhs = {var1: pybamm.InputParameter("rate") * var1}
         model.initial_conditions = {var1: pybamm.InputParameter("ic 1")}
 
-        # Solve
+        # Solve with different initial conditions, the solver only sets the model
+        # up for the first solve
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
-        t_eval = np.linspace(0, 5, 100)
-        solution = solver.solve(model, t_eval, inputs={"rate": -1, "ic 1": 0.1})
-        np.testing.assert_array_almost_equal(
-            solution.y[0], 0.1 * np.exp(-solution.t), decimal=5
-        )
-
-        # Solve again with different initial conditions
-        solution = solver.solve(model, t_eval, inputs={"rate": -0.1, "ic 1": 1})
-        np.testing.assert_array_almost_equal(
-            solution.y[0], 1 * np.exp(-0.1 * solution.t), decimal=5
-        )
+        t_eval = _T_EVAL_5_100
+        for inputs in [{"rate": -1, "ic 1": 0.1}, {"rate": -0.1, "ic 1": 1}]:
+            with subtests.test(inputs=inputs):
+                solution = solver.solve(model, t_eval, inputs=inputs)
+                np.testing.assert_array_almost_equal(
+                    solution.y[0],
+                    inputs["ic 1"] * np.exp(inputs["rate"] * solution.t),
+                    decimal=5,
+                )
 
     def test_model_solver_manually_update_initial_conditions(self):
         # Create model
@@ -452,7 +458,7 @@ class TestScipySolver:
 
         # Solve
         solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
-        t_eval = np.linspace(0, 5, 100)
+        t_eval = _T_EVAL_5_100
         solution = solver.solve(model, t_eval)
         np.testing.assert_array_almost_equal(
             solution.y[0], 1 * np.exp(-solution.t), decimal=5
@@ -476,7 +482,7 @@ class TestScipySolver:
         model.initial_conditions = {var1: 3}
         model.variables = {"var1": var1}
         solver = pybamm.ScipySolver()
-        t_eval = np.linspace(0, 5, 100)
+        t_eval = _T_EVAL_5_100
         solution = solver.solve(model, t_eval)
 
         # Check that the initial conditions and solution are scaled correctly
@@ -501,24 +507,21 @@ class TestScipySolverWithSensitivity:
         # Solve
         # Make sure that passing in extra options works
         solver = pybamm.ScipySolver(rtol=1e-10, atol=1e-10)
-        t_eval = np.linspace(0, 1, 80)
+        t_eval = _T_EVAL_1_80
         solution = solver.solve(
             model, t_eval, inputs={"p": 0.1}, calculate_sensitivities=True
         )
         np.testing.assert_array_equal(solution.t, t_eval)
-        np.testing.assert_allclose(solution.y[0], np.exp(0.1 * solution.t))
+        exp_p = np.exp(0.1 * solution.t)
+        np.testing.assert_allclose(solution.y[0], exp_p)
         np.testing.assert_allclose(
             solution.sensitivities["p"],
-            (solution.t * np.exp(0.1 * solution.t))[:, np.newaxis],
-        )
-        np.testing.assert_allclose(
-            solution["var squared"].data, np.exp(0.1 * solution.t) ** 2
+            (solution.t * exp_p)[:, np.newaxis],
         )
+        np.testing.assert_allclose(solution["var squared"].data, exp_p**2)
         np.testing.assert_allclose(
             solution["var squared"].sensitivities["p"],
-            (2 * np.exp(0.1 * solution.t) * solution.t * np.exp(0.1 * solution.t))[
-                :, np.newaxis
-            ],
+            (2 * solution.t * np.exp(0.2 * solution.t))[:, np.newaxis],
         )
 
         # More complicated model
@@ -536,7 +539,7 @@ class TestScipySolverWithSensitivity:
         # Solve
         # Make sure that passing in extra options works
         solver = pybamm.ScipySolver(rtol=1e-10, atol=1e-10)
-        t_eval = np.linspace(0, 1, 80)
+        t_eval = _T_EVAL_1_80
         solution = solver.solve(
             model,
             t_eval,
@@ -554,17 +557,7 @@ class TestScipySolverWithSensitivity:
         )
         np.testing.assert_allclose(solution.sensitivities["r"], 1)
         np.testing.assert_allclose(solution.sensitivities["s"], 0)
-        np.testing.assert_allclose(
-            solution.sensitivities["all"],
-            np.hstack(
-                [
-                    solution.sensitivities["p"],
-                    solution.sensitivities["q"],
-                    solution.sensitivities["r"],
-                    solution.sensitivities["s"],
-                ]
-            ),
-        )
+        assert_all_sensitivities(solution.sensitivities, ["p", "q", "r", "s"])
         np.testing.assert_allclose(
             solution["var times s"].data, 0.5 * (-1 + 0.2 * solution.t)
         )
@@ -581,16 +574,8 @@ class TestScipySolverWithSensitivity:
             solution["var times s"].sensitivities["s"],
             (-1 + 0.2 * solution.t)[:, np.newaxis],
         )
-        np.testing.assert_allclose(
-            solution["var times s"].sensitivities["all"],
-            np.hstack(
-                [
-                    solution["var times s"].sensitivities["p"],
-                    solution["var times s"].sensitivities["q"],
-                    solution["var times s"].sensitivities["r"],
-                    solution["var times s"].sensitivities["s"],
-                ]
-            ),
+        assert_all_sensitivities(
+            solution["var times s"].sensitivities, ["p", "q", "r", "s"]
         )
 
     def test_solve_sensitivity_vector_var_scalar_input(self):
@@ -608,13 +593,13 @@ class TestScipySolverWithSensitivity:
 
         # Solve - scalar input
         solver = pybamm.ScipySolver()
-        t_eval = np.linspace(0, 1)
+        t_eval = _T_EVAL_1_50
         solution = solver.solve(
             model, t_eval, inputs={"param": 7}, calculate_sensitivities=True
         )
         np.testing.assert_array_almost_equal(
             solution["var"].data,
-            np.tile(2 * np.exp(-7 * t_eval), (n, 1)),
+            np.broadcast_to(2 * np.exp(-7 * t_eval), (n, t_eval.size)),
             decimal=4,
         )
         np.testing.assert_array_almost_equal(
@@ -641,14 +626,16 @@ class TestScipySolverWithSensitivity:
         # Solve
         # Make sure that passing in extra options works
         solver = pybamm.ScipySolver(rtol=1e-10, atol=1e-10)
-        t_eval = np.linspace(0, 1, 80)
+        t_eval = _T_EVAL_1_80
         solution = solver.solve(
             model,
             t_eval,
             inputs={"p": 0.1, "q": 2, "r": -1, "s": 0.5},
             calculate_sensitivities=True,
         )
-        np.testing.assert_allclose(solution.y, np.tile(-1 + 0.2 * solution.t, (n, 1)))
+        np.testing.assert_allclose(
+            solution.y, np.broadcast_to(-1 + 0.2 * solution.t, (n, solution.t.size))
+        )
         np.testing.assert_allclose(
             solution.sensitivities["p"],
             np.repeat(2 * solution.t, n)[:, np.newaxis],
@@ -659,19 +646,10 @@ class TestScipySolverWithSensitivity:
         )
         np.testing.assert_allclose(solution.sensitivities["r"], 1)
         np.testing.assert_allclose(solution.sensitivities["s"], 0)
+        assert_all_sensitivities(solution.sensitivities, ["p", "q", "r", "s"])
         np.testing.assert_allclose(
-            solution.sensitivities["all"],
-            np.hstack(
-                [
-                    solution.sensitivities["p"],
-                    solution.sensitivities["q"],
-                    solution.sensitivities["r"],
-                    solution.sensitivities["s"],
-                ]
-            ),
-        )
-        np.testing.assert_allclose(
-            solution["var times s"].data, np.tile(0.5 * (-1 + 0.2 * solution.t), (n, 1))
+            solution["var times s"].data,
+            np.broadcast_to(0.5 * (-1 + 0.2 * solution.t), (n, solution.t.size)),
         )
         np.testing.assert_allclose(
             solution["var times s"].sensitivities["p"],
@@ -686,19 +664,11 @@ class TestScipySolverWithSensitivity:
             solution["var times s"].sensitivities["s"],
             np.repeat(-1 + 0.2 * solution.t, n)[:, np.newaxis],
         )
-        np.testing.assert_allclose(
-            solution["var times s"].sensitivities["all"],
-            np.hstack(
-                [
-                    solution["var times s"].sensitivities["p"],
-                    solution["var times s"].sensitivities["q"],
-                    solution["var times s"].sensitivities["r"],
-                    solution["var times s"].sensitivities["s"],
-                ]
-            ),
+        assert_all_sensitivities(
+            solution["var times s"].sensitivities, ["p", "q", "r", "s"]
         )
 
-    def test_solve_sensitivity_vector_var_vector_input(self):
+    def test_solve_sensitivity_vector_var_vector_input(self, mesh, disc):
         var = pybamm.Variable("var", "negative electrode")
         model = pybamm.BaseModel()
 
@@ -710,16 +680,12 @@ class TestScipySolverWithSensitivity:
             "integral of var": pybamm.Integral(var, pybamm.standard_spatial_vars.x_n),
         }
 
-        # create discretisation
-        mesh = get_mesh_for_testing()
-        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
-        disc = pybamm.Discretisation(mesh, spatial_methods)
         disc.process_model(model)
         n = disc.mesh["negative electrode"].npts
 
         # Solve - constant input
         solver = pybamm.ScipySolver(rtol=1e-10, atol=1e-10)
-        t_eval = np.linspace(0, 1)
+        t_eval = _T_EVAL_1_50
         solution = solver.solve(
             model,
             t_eval,
@@ -729,13 +695,17 @@ class TestScipySolverWithSensitivity:
         l_n = mesh["negative electrode"].edges[-1]
         np.testing.assert_array_almost_equal(
             solution["var"].data,
-            np.tile(2 * np.exp(-7 * t_eval), (n, 1)),
+            np.broadcast_to(2 * np.exp(-7 * t_eval), (n, t_eval.size)),
             decimal=4,
         )
 
         np.testing.assert_array_almost_equal(
             solution["var"].sensitivities["param"],
-            np.vstack([np.eye(n) * -2 * t * np.exp(-7 * t) for t in t_eval]),
+            # stacked diagonal blocks, one per time point
+            (
+                (-2 * t_eval * np.exp(-7 * t_eval))[:, np.newaxis, np.newaxis]
+                * np.eye(n)
+            ).reshape(-1, n),
         )
         np.testing.assert_array_almost_equal(
             solution["integral of var"].data,
@@ -744,35 +714,35 @@ class TestScipySolverWithSensitivity:
         )
         np.testing.assert_array_almost_equal(
             solution["integral of var"].sensitivities["param"],
-            np.tile(-2 * t_eval * np.exp(-7 * t_eval) * l_n / n, (n, 1)).T,
+            np.broadcast_to(
+                (-2 * t_eval * np.exp(-7 * t_eval) * l_n / n)[:, np.newaxis],
+                (t_eval.size, n),
+            ),
         )
 
         # Solve - linspace input
         solver = pybamm.ScipySolver(rtol=1e-10, atol=1e-10)
-        t_eval = np.linspace(0, 1)
+        t_eval = _T_EVAL_1_50
         p_eval = np.linspace(1, 2, n)
         solution = solver.solve(
             model, t_eval, inputs={"param": p_eval}, calculate_sensitivities=True
         )
         l_n = mesh["negative electrode"].edges[-1]
-        np.testing.assert_array_almost_equal(
-            solution["var"].data, 2 * np.exp(-p_eval[:, np.newaxis] * t_eval), decimal=4
-        )
+        # var = 2 exp(-p t) on the (n, T) grid, shared by all the expected values
+        var_data = 2 * np.exp(-p_eval[:, np.newaxis] * t_eval)
+        np.testing.assert_array_almost_equal(solution["var"].data, var_data, decimal=4)
+        # derivative of var with respect to its own param at each time point
+        dvar_dp = -t_eval[:, np.newaxis] * var_data.T
         np.testing.assert_array_almost_equal(
             solution["var"].sensitivities["param"],
-            np.vstack([np.diag(-2 * t * np.exp(-p_eval * t)) for t in t_eval]),
+            (dvar_dp[:, :, np.newaxis] * np.eye(n)).reshape(-1, n),
         )
 
         np.testing.assert_array_almost_equal(
             solution["integral of var"].data,
-            np.sum(
-                2
-                * np.exp(-p_eval[:, np.newaxis] * t_eval)
-                * mesh["negative electrode"].d_edges[:, np.newaxis],
-                axis=0,
-            ),
+            mesh["negative electrode"].d_edges @ var_data,
         )
         np.testing.assert_array_almost_equal(
             solution["integral of var"].sensitivities["param"],
-            np.vstack([-2 * t * np.exp(-p_eval * t) * l_n / n for t in t_eval]),
+            dvar_dp * l_n / n,
         )